@@ -12,10 +12,26 @@
 #       * Votes autorisés uniquement sur ces nouveaux messages
 #       * /close_votes pendant Round 2 → clôture immédiate + résultats
 # - Toutes les commandes slash utilisent defer/followup pour éviter le timeout
+# - GALLERY_MODE=paged : galerie paginée (boutons + menu) et votes par interactions,
+#       nombre d'appels API constant à l'ouverture quel que soit le nombre de photos
+# - Après chaque reprise gateway : réconciliation incrémentale de l'index des dépôts
+# - WORKER_MODE=queue : les appels REST (publication des ballots R1/R2, suppressions,
+#       avertissements, réactions, verrouillage R1) passent par une file SQLite consommée
+#       par des workers (`python bot.py worker <index> <count>`) au débit partagé
+# - /debug_profile : profil échantillonné (CPU + attentes des tâches) envoyé au format flamegraph
 # -----------------------------------------
 
 import os
+import io
+import sys
+import json
+import time
+import sqlite3
 import asyncio
+import functools
+import threading
+from collections import Counter, deque
+from queue import SimpleQueue
 from datetime import datetime, timedelta
 
 import discord
@@ -32,10 +48,35 @@ GUILD_ID = int(os.getenv("GUILD_ID"))
 PHOTO_CHANNEL_ID = int(os.getenv("PHOTO_CHANNEL_ID"))
 PHOTO_RESULT_CHANNEL_ID = int(os.getenv("PHOTO_RESULT_CHANNEL_ID"))
 VOTE_EMOJI = os.getenv("VOTE_EMOJI")  # ex: "👍" ou "<:vote:123456>"
-REPORTER_ROLE_ID = int(os.getenv("REPORTER"))
-REPORTER_BORDEAUX_ROLE_ID = int(os.getenv("REPORTER_BORDEAUX"))
+
+def _parse_role_ids(*values: str | None) -> list[int]:
+    """Liste d'ids de rôles depuis des variables d'env (séparées par des virgules)."""
+    ids: list[int] = []
+    for value in values:
+        for part in (value or "").split(","):
+            part = part.strip()
+            if part and int(part) not in ids:
+                ids.append(int(part))
+    return ids
+
+# Rôles reporters (modération + mentions) : REPORTER_ROLES="id1,id2,..."
+# ou, à défaut, l'ancien couple REPORTER / REPORTER_BORDEAUX
+REPORTER_ROLE_IDS = _parse_role_ids(os.getenv("REPORTER_ROLES")) or \
+    _parse_role_ids(os.getenv("REPORTER"), os.getenv("REPORTER_BORDEAUX"))
+# Rôles autorisés à voter (vide = tout le monde)
+VOTER_ROLE_IDS = set(_parse_role_ids(os.getenv("VOTER_ROLES")))
 
 DEFAULT_TIE_MINUTES = 6 * 60  # 6h
+GALLERY_MODE = os.getenv("GALLERY_MODE", "reactions").lower()  # "reactions" (1 message/photo) ou "paged"
+WORKER_MODE = os.getenv("WORKER_MODE", "inline").lower()  # "inline" (REST dans la boucle gateway) ou "queue"
+QUEUE_DB = os.getenv("QUEUE_DB", "rest_jobs.sqlite3")
+QUEUE_POLL_SECONDS = 0.2
+QUEUE_RATE_PER_SECOND = float(os.getenv("QUEUE_RATE_PER_SECOND", "40"))  # budget REST partagé par tous les workers
+BALLOT_WAIT_SECONDS = int(os.getenv("BALLOT_WAIT_SECONDS", "600"))      # attente max des ballots publiés par les workers
+SLOW_CALLBACK_MS = int(os.getenv("SLOW_CALLBACK_MS", "0"))  # >0 : signale les callbacks asyncio plus lents (mode debug)
+RECONCILE_SCAN_BUDGET = int(os.getenv("RECONCILE_SCAN_BUDGET", "10"))  # max d'appels API (pages d'historique) par passe
+RECONCILE_RETRY_SECONDS = 5  # délai avant la passe suivante si le budget est épuisé
+HISTORY_PAGE = 100           # messages par appel d'historique
 
 # =========================
 # INTENTS & BOT
@@ -45,6 +86,10 @@ intents.messages = True
 intents.guilds = True
 intents.message_content = True
 intents.reactions = True
+# MEMBERS_INTENT=1 : on_member_update maintient le cache des rôles (intent privilégié à activer sur le portail).
+# Sinon chaque membre est réindexé à partir de l'objet reçu avec l'interaction/la réaction.
+MEMBERS_INTENT = os.getenv("MEMBERS_INTENT") == "1"
+intents.members = MEMBERS_INTENT
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
@@ -53,12 +98,19 @@ bot = commands.Bot(command_prefix="!", intents=intents)
 # =========================
 votes_open = False
 photo_start_time: datetime | None = None
+contest_id: int | None = None  # id stable du concours (créé par /start_posting), clé de partition des workers
 
 # Phase dépôt : 1 photo / personne (suppression = slot libéré)
 submitted_users: set[int] = set()
 user_to_msgids: dict[int, set[int]] = {}
 msgid_to_user: dict[int, int] = {}
 
+# Réconciliation après coupure gateway
+last_seen_photo_msgid: int | None = None  # checkpoint : dernier message vu dans le salon photo
+reconcile_task: asyncio.Task | None = None
+reconcile_verify_after: int | None = None # reprise de la vérification des suppressions (id de message)
+handled_photo_msgids: dict[int, None] = {} # messages déjà traités (on_message ou réconciliation), borné
+
 # Galerie Round 1
 gallery_thread_id: int | None = None      # thread courant (on ne supprime pas les anciens)
 round1_ballots: list[discord.Message] = [] # messages (embeds) pour voter au Round 1
@@ -75,6 +127,171 @@ tie_finishing = False
 round2_ballots: list[discord.Message] = [] # messages (embeds) Round 2 (finalistes)
 tie_allowed_ids: set[int] = set()          # ids autorisés à recevoir des votes au Round 2
 
+# Mode galerie paginée (GALLERY_MODE=paged) : galerie du round en cours
+paged_gallery: "PagedGallery | None" = None
+
+# =========================
+# CACHE RÔLES / PERMISSIONS (par serveur)
+# =========================
+role_verdicts: dict[tuple[int, bool, frozenset[int]], tuple[bool, bool]] = {}  # (guild, owner, rôles) -> (modo, votant)
+
+def _role_verdict(member: discord.Member) -> tuple[bool, bool]:
+    """(modérateur, votant), calculé une fois par combinaison de rôles du serveur."""
+    key = (member.guild.id, member.guild.owner_id == member.id, frozenset(member._roles))
+    verdict = role_verdicts.get(key)
+    if verdict is None:
+        rids = key[2]
+        mod = member.guild_permissions.manage_guild or any(rid in rids for rid in REPORTER_ROLE_IDS)
+        voter = not VOTER_ROLE_IDS or bool(rids & VOTER_ROLE_IDS)
+        verdict = role_verdicts[key] = (mod, voter)
+    return verdict
+
+class GuildRoleCache:
+    """Appartenance précalculée d'un serveur (MEMBERS_INTENT) : modérateurs et votants, réponses en O(1)."""
+
+    def __init__(self, guild: discord.Guild):
+        self.moderators: set[int] = set()
+        self.voters: set[int] = set()
+        self.known: set[int] = set()  # membres déjà indexés
+        for member in guild.members:
+            self.index(member)
+
+    def index(self, member: discord.Member):
+        mod, voter = _role_verdict(member)
+        (self.moderators.add if mod else self.moderators.discard)(member.id)
+        (self.voters.add if voter else self.voters.discard)(member.id)
+        self.known.add(member.id)
+
+    def forget(self, member_id: int):
+        self.moderators.discard(member_id)
+        self.voters.discard(member_id)
+        self.known.discard(member_id)
+
+role_caches: dict[int, GuildRoleCache] = {}  # guild_id -> cache
+
+def _role_cache(guild: discord.Guild) -> GuildRoleCache:
+    cache = role_caches.get(guild.id)
+    if cache is None:
+        cache = role_caches[guild.id] = GuildRoleCache(guild)
+    return cache
+
+def member_verdict(guild: discord.Guild, member: discord.Member | None, member_id: int) -> tuple[bool, bool]:
+    """
+    (modérateur, votant) d'un membre.
+    Avec MEMBERS_INTENT : cache par membre, tenu à jour par les événements (indexation à la volée si inconnu).
+    Sans : aucun événement ne signale les changements de rôles, on part du membre fourni
+    (frais, issu de l'événement) et du verdict mis en cache pour sa combinaison de rôles.
+    """
+    if MEMBERS_INTENT:
+        cache = _role_cache(guild)
+        if member_id not in cache.known:
+            member = member or guild.get_member(member_id)
+            if member is not None:
+                cache.index(member)
+        return member_id in cache.moderators, member_id in cache.voters
+    member = member or guild.get_member(member_id)
+    return _role_verdict(member) if member is not None else (False, False)
+
+def can_vote(guild_id: int | None, user_id: int, member: discord.Member | None = None) -> bool:
+    if not VOTER_ROLE_IDS:
+        return True
+    guild = bot.get_guild(guild_id) if guild_id else None
+    if guild is None:
+        return False
+    return member_verdict(guild, member, user_id)[1]
+
+def reporter_mentions() -> str:
+    return " ".join(f"<@&{rid}>" for rid in REPORTER_ROLE_IDS)
+
+# =========================
+# PROFILING
+# =========================
+coro_timings: dict[str, deque[float]] = {}  # nom -> dernières durées (s)
+active_profiler: "SamplingProfiler | None" = None
+
+def timed(fn):
+    """Mesure le temps mural de chaque appel de la coroutine."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            coro_timings.setdefault(fn.__name__, deque(maxlen=50)).append(elapsed)
+            if SLOW_CALLBACK_MS > 0:
+                print(f"⏱️ {fn.__name__}: {elapsed:.2f}s")
+    return wrapper
+
+def timings_summary() -> str:
+    lines = []
+    for name, durations in sorted(coro_timings.items()):
+        lines.append(f"- `{name}` : {len(durations)} appel(s), dernier **{durations[-1]:.2f}s**, "
+                     f"max **{max(durations):.2f}s**")
+    return "\n".join(lines) or "- (aucune mesure)"
+
+def enable_slow_callback_detection(loop: asyncio.AbstractEventLoop):
+    if SLOW_CALLBACK_MS > 0 and not loop.get_debug():
+        loop.set_debug(True)
+        loop.slow_callback_duration = SLOW_CALLBACK_MS / 1000
+        print(f"🐢 Détection des callbacks lents > {SLOW_CALLBACK_MS} ms activée")
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+class SamplingProfiler:
+    """
+    Échantillonneur sans dépendance, sortie "folded" (flamegraph.pl / speedscope) :
+      - cpu   : pile du thread de la boucle (travail CPU ; select() = boucle inactive)
+      - await : chaîne d'await de chaque tâche (attentes REST, sleeps de rate-limit…)
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = 0.005, await_interval: float = 0.05):
+        self.loop = loop
+        self.interval = interval
+        self.await_interval = await_interval
+        self.loop_thread_id = threading.get_ident()
+        self.cpu_stacks: Counter[str] = Counter()
+        self.await_stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+
+    def _sample_cpu(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.cpu_stacks[";".join(reversed(stack))] += 1
+
+    def _sample_awaits(self):
+        for task in asyncio.all_tasks(self.loop):
+            stack = [task.get_name()]
+            coro = task.get_coro()
+            while coro is not None:
+                frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+                if frame is not None:
+                    stack.append(_frame_label(frame))
+                coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+            self.await_stacks[";".join(stack)] += 1
+
+    async def run(self, seconds: int):
+        sampler = threading.Thread(target=self._sample_cpu, name="profiler", daemon=True)
+        sampler.start()
+        try:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                self._sample_awaits()
+                await asyncio.sleep(self.await_interval)
+        finally:
+            self._stop.set()
+            sampler.join()
+
+    @staticmethod
+    def folded(stacks: Counter[str]) -> bytes:
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()).encode()
+
 # =========================
 # HELPERS
 # =========================
@@ -82,10 +299,7 @@ def is_moderator(inter: discord.Interaction) -> bool:
     if inter.user is None or not isinstance(inter.user, discord.Member):
         return False
     m: discord.Member = inter.user
-    if m.guild_permissions.manage_guild:
-        return True
-    rids = {r.id for r in m.roles}
-    return (REPORTER_ROLE_ID in rids) or (REPORTER_BORDEAUX_ROLE_ID in rids)
+    return member_verdict(m.guild, m, m.id)[0]
 
 def moderator_check():
     return app_commands.check(lambda inter: is_moderator(inter))
@@ -97,6 +311,10 @@ def count_image_attachments(msg: discord.Message) -> int:
 def is_image_message(msg: discord.Message) -> bool:
     return count_image_attachments(msg) > 0
 
+def first_image_url(msg: discord.Message) -> str | None:
+    return next((att.url for att in (msg.attachments or [])
+                 if att.filename.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".webp"))), None)
+
 def posting_phase_active() -> bool:
     return photo_start_time is not None and not votes_open and not tie_round_active
 
@@ -108,21 +326,31 @@ def fmt_duration(minutes: int) -> str:
         return f"{h}h"
     return f"{m} min"
 
-async def tally_votes_only(messages: list[discord.Message]):
-    """Compte les votes uniquement sur la liste donnée."""
+@timed
+async def tally_votes_only(messages: list[discord.Message | discord.PartialMessage]):
+    """Compte les votes uniquement sur la liste donnée (via l'historique : 1 appel / 100 messages)."""
     max_votes = 0
     vote_map: dict[discord.Message, int] = {}
+    by_channel: dict[int, tuple[discord.abc.Messageable, set[int]]] = {}
     for msg in messages:
+        by_channel.setdefault(msg.channel.id, (msg.channel, set()))[1].add(msg.id)
+    for channel, wanted in by_channel.values():
         try:
-            fetched = await msg.channel.fetch_message(msg.id)
-            cnt = 0
-            for r in fetched.reactions:
-                if str(r.emoji) == VOTE_EMOJI:
-                    cnt = r.count
+            after = discord.Object(id=min(wanted) - 1)
+            async for fetched in channel.history(after=after, limit=None, oldest_first=True):
+                if fetched.id not in wanted:
+                    continue
+                cnt = 0
+                for r in fetched.reactions:
+                    if str(r.emoji) == VOTE_EMOJI:
+                        cnt = r.count
+                        break
+                vote_map[fetched] = cnt
+                if cnt > max_votes:
+                    max_votes = cnt
+                wanted.discard(fetched.id)
+                if not wanted:
                     break
-            vote_map[fetched] = cnt
-            if cnt > max_votes:
-                max_votes = cnt
         except Exception as e:
             print(f"⚠️ tally error: {e}")
     return max_votes, vote_map
@@ -143,6 +371,373 @@ def _forget_submission_by_msgid(message_id: int):
             user_to_msgids.pop(user_id, None)
             submitted_users.discard(user_id)
 
+def _advance_checkpoint(message_id: int):
+    global last_seen_photo_msgid
+    if last_seen_photo_msgid is None or message_id > last_seen_photo_msgid:
+        last_seen_photo_msgid = message_id
+
+def _claim_photo_message(message_id: int) -> bool:
+    """True si le message n'a pas encore été traité (évite un double traitement on_message/réconciliation)."""
+    if message_id in handled_photo_msgids:
+        return False
+    handled_photo_msgids[message_id] = None
+    if len(handled_photo_msgids) > 1000:
+        del handled_photo_msgids[next(iter(handled_photo_msgids))]
+    return True
+
+async def moderate_photo_message(message: discord.Message) -> bool:
+    """Applique les règles du salon photo. Renvoie False si le message a été rejeté."""
+    # Pendant n'importe quel vote (R1/R2) -> pas de nouveaux posts
+    if votes_open:
+        await _reject(message, f"❌ {message.author.mention}, votes en cours. Nouveaux posts interdits.")
+        return False
+
+    # Phase dépôt: 1 image / message, 1 photo / personne
+    if posting_phase_active():
+        img_count = count_image_attachments(message)
+        if img_count == 0:
+            await _reject(message, f"🚫 {message.author.mention}, seuls les **messages avec photo** sont autorisés.")
+            return False
+        if img_count > 1:
+            await _reject(message, f"🚫 {message.author.mention}, **1 image par message** et **1 photo par personne**.")
+            return False
+        if message.author.id in submitted_users:
+            await _reject(
+                message,
+                f"🚫 {message.author.mention}, tu as déjà posté **1 photo**. "
+                f"Supprime ton message initial pour remplacer."
+            )
+            return False
+
+        _record_submission(message.author.id, message.id)
+
+    else:
+        # Pas de concours : on garde le salon propre
+        if not is_image_message(message):
+            await _reject(message, f"🚫 {message.author.mention}, aucun concours en cours. Les messages sans photo sont supprimés.")
+            return False
+
+    return True
+
+# =========================
+# RECONCILIATION (après coupure gateway)
+# =========================
+def _history_calls(count: int) -> int:
+    return max(1, -(-count // HISTORY_PAGE))
+
+async def reconcile_submissions() -> bool:
+    """
+    Corrige l'index des dépôts après des événements manqués :
+      - parcourt l'historique postérieur au checkpoint et applique les règles du salon
+      - vérifie une tranche de l'historique du concours et retire les dépôts indexés disparus
+        (suppressions manquées) ; le curseur tourne d'une reprise à l'autre
+    Le tout dans la limite de RECONCILE_SCAN_BUDGET appels API.
+    Renvoie True si le delta n'a pas pu être parcouru entièrement : une passe suivante est nécessaire.
+    """
+    global reconcile_verify_after
+
+    if photo_start_time is None:
+        return False
+    chan = bot.get_channel(PHOTO_CHANNEL_ID)
+    if not isinstance(chan, discord.TextChannel):
+        return False
+
+    calls = RECONCILE_SCAN_BUDGET
+    pending = False
+    accepted = rejected = removed = 0
+
+    # 1) Delta depuis le checkpoint : mêmes règles qu'on_message
+    after = discord.Object(id=last_seen_photo_msgid) if last_seen_photo_msgid else photo_start_time
+    limit = calls * HISTORY_PAGE
+    scanned = 0
+    try:
+        async for msg in chan.history(after=after, limit=limit, oldest_first=True):
+            scanned += 1
+            _advance_checkpoint(msg.id)
+            if msg.author == bot.user or not _claim_photo_message(msg.id):
+                continue
+            if await moderate_photo_message(msg):
+                accepted += 1
+            else:
+                rejected += 1
+    except Exception as e:
+        print(f"⚠️ reconcile history error: {e}")
+    calls -= _history_calls(scanned)
+    pending = scanned >= limit
+
+    # 2) Suppressions manquées : diff entre une tranche de l'historique et l'index.
+    #    Une seule tranche par reprise ; le curseur est conservé pour la reprise suivante.
+    if not pending and posting_phase_active() and msgid_to_user and calls > 0:
+        lower = reconcile_verify_after or 0
+        # borne haute figée avant le parcours : les messages plus récents passent par on_message
+        upper = last_seen_photo_msgid or 0
+        after = discord.Object(id=reconcile_verify_after) if reconcile_verify_after else photo_start_time
+        limit = calls * HISTORY_PAGE
+        seen: set[int] = set()
+        try:
+            async for msg in chan.history(after=after, limit=limit, oldest_first=True):
+                seen.add(msg.id)
+        except Exception as e:
+            print(f"⚠️ reconcile history error: {e}")
+        else:
+            exhausted = len(seen) >= limit
+            if exhausted:
+                # tranche partielle : seule la plage parcourue fait foi
+                upper = max(seen)
+            for msg_id in [mid for mid in msgid_to_user if lower < mid <= upper and mid not in seen]:
+                _forget_submission_by_msgid(msg_id)
+                removed += 1
+            # fin de l'historique atteinte → la prochaine reprise repart du début du concours
+            reconcile_verify_after = max(seen) if exhausted else None
+
+    if accepted or rejected or removed:
+        print(f"🔁 Réconciliation : +{accepted} / rejetés {rejected} / -{removed} dépôt(s)")
+    return pending
+
+async def _reconcile_until_done():
+    while await reconcile_submissions():
+        await asyncio.sleep(RECONCILE_RETRY_SECONDS)
+
+def schedule_reconcile():
+    global reconcile_task
+    if reconcile_task and not reconcile_task.done():
+        return
+    reconcile_task = asyncio.create_task(_reconcile_until_done())
+
+# =========================
+# FILE DE TRAVAUX REST (gateway → workers)
+# =========================
+class JobQueue:
+    """
+    File locale SQLite (WAL) partagée entre processus : le gateway publie, chaque worker
+    consomme sa partition (partition_key % count == index), dans l'ordre. Les jobs d'un
+    concours partagent une clé (ordre garanti) ; chaque ballot a la sienne (publication parallèle).
+    Les workers partagent aussi un budget de débit REST (table rate) et renvoient les ids
+    des ballots publiés (table results).
+    """
+
+    STALE_SECONDS = 60  # un job réclamé mais jamais acquitté (worker mort) est repris
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = self._connect()
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " partition_key INTEGER NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " claimed_at REAL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " batch TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " ballot_id INTEGER,"
+            " PRIMARY KEY (batch, idx))"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS rate (id INTEGER PRIMARY KEY CHECK (id = 1), next_at REAL NOT NULL)")
+        self._pending: SimpleQueue | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")  # pas de fsync par insertion en WAL
+        return db
+
+    def publish(self, kind: str, partition_key: int, payload: dict):
+        """
+        Non bloquant (boucle gateway) : un thread écrivain dédié fait les insertions,
+        dans l'ordre de publication, sans jamais attendre le verrou d'un worker dans la boucle.
+        """
+        if self._pending is None:
+            self._pending = SimpleQueue()
+            threading.Thread(target=self._writer, name="job-writer", daemon=True).start()
+        self._pending.put((kind, partition_key, payload))
+
+    def _writer(self):
+        db = self._connect()
+        while True:
+            kind, key, payload = self._pending.get()
+            try:
+                db.execute("INSERT INTO jobs (partition_key, kind, payload) VALUES (?, ?, ?)",
+                           (key, kind, json.dumps(payload)))
+            except Exception as e:
+                print(f"⚠️ job queue write error ({kind}): {e}")
+
+    def claim(self, worker_index: int, worker_count: int, limit: int = 20) -> list[tuple[int, str, dict]]:
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.db.execute(
+                "SELECT id, kind, payload FROM jobs"
+                " WHERE partition_key % ? = ? AND (claimed_at IS NULL OR claimed_at < ?)"
+                " ORDER BY id LIMIT ?",
+                (worker_count, worker_index, now - self.STALE_SECONDS, limit)
+            ).fetchall()
+            self.db.executemany("UPDATE jobs SET claimed_at = ? WHERE id = ?", [(now, r[0]) for r in rows])
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return [(job_id, kind, json.loads(payload)) for job_id, kind, payload in rows]
+
+    def ack(self, job_id: int):
+        self.db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def reserve(self, cost: int, rate: float) -> float:
+        """Réserve `cost` appels sur le budget partagé ; renvoie le délai à attendre avant de les faire."""
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT next_at FROM rate WHERE id = 1").fetchone()
+            slot = max(now, row[0] if row else now)
+            self.db.execute("INSERT OR REPLACE INTO rate (id, next_at) VALUES (1, ?)", (slot + cost / rate,))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return slot - now
+
+    def record_result(self, batch: str, index: int, ballot_id: int | None):
+        self.db.execute("INSERT OR REPLACE INTO results (batch, idx, ballot_id) VALUES (?, ?, ?)",
+                        (batch, index, ballot_id))
+
+    def _read_results(self, batch: str) -> dict[int, int | None]:
+        db = self._connect()
+        try:
+            return dict(db.execute("SELECT idx, ballot_id FROM results WHERE batch = ?", (batch,)).fetchall())
+        finally:
+            db.close()
+
+    def _drop_results(self, batch: str):
+        db = self._connect()
+        try:
+            db.execute("DELETE FROM results WHERE batch = ?", (batch,))
+        finally:
+            db.close()
+
+    async def wait_results(self, batch: str, expected: int, timeout: float) -> dict[int, int | None]:
+        """Attend (hors de la boucle) les ids des ballots publiés par les workers."""
+        deadline = time.monotonic() + timeout
+        while True:
+            results = await asyncio.to_thread(self._read_results, batch)
+            if len(results) >= expected or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(QUEUE_POLL_SECONDS)
+        await asyncio.to_thread(self._drop_results, batch)
+        return results
+
+job_queue: JobQueue | None = JobQueue(QUEUE_DB) if WORKER_MODE == "queue" else None
+
+JOB_COSTS = {"post_ballot": 2, "lock_ballot": 2}  # appels REST par job (1 par défaut)
+
+def contest_key() -> int:
+    """Clé de partition : le concours en cours (stable du dépôt à la fin des votes), sinon le salon photo."""
+    return contest_id or PHOTO_CHANNEL_ID
+
+async def run_job(client: discord.Client, kind: str, payload: dict):
+    """Exécute un appel REST sérialisé (ids uniquement, aucun objet du cache gateway)."""
+    chan = client.get_partial_messageable(payload["channel_id"])
+    if kind == "delete_message":
+        await chan.get_partial_message(payload["message_id"]).delete()
+    elif kind == "send_message":
+        await chan.send(payload["content"], delete_after=payload.get("delete_after"))
+    elif kind == "remove_reaction":
+        await chan.get_partial_message(payload["message_id"]).remove_reaction(
+            payload["emoji"], discord.Object(id=payload["user_id"]))
+    elif kind == "post_ballot":
+        ballot = await chan.send(embed=discord.Embed.from_dict(payload["embed"]))
+        await ballot.add_reaction(payload["emoji"])
+        return ballot.id
+    elif kind == "lock_ballot":
+        ballot = chan.get_partial_message(payload["message_id"])
+        await ballot.clear_reactions()
+        if payload.get("embed"):
+            await ballot.edit(embed=discord.Embed.from_dict(payload["embed"]))
+    else:
+        raise ValueError(f"unknown job kind: {kind}")
+
+async def dispatch_rest(kind: str, **payload):
+    """Mode queue : publie le job pour les workers. Sinon : exécution immédiate dans la boucle."""
+    if job_queue is not None:
+        job_queue.publish(kind, contest_key(), payload)
+        return
+    try:
+        await run_job(bot, kind, payload)
+    except Exception as e:
+        print(f"⚠️ {kind} error: {e}")
+
+async def post_ballots(thread: discord.Thread | discord.TextChannel,
+                       embeds: list[discord.Embed],
+                       batch: str) -> list[discord.Message | discord.PartialMessage | None]:
+    """
+    Publie les ballots (embed + emoji de vote) ; renvoie le message de chaque ballot, None si échec.
+    Mode queue : un job par ballot, réparti entre les workers selon son rang dans le concours,
+    le gateway n'attend que les ids en retour (l'ordre d'affichage dans le fil peut alors
+    différer légèrement de la numérotation).
+    """
+    if job_queue is None:
+        ballots = []
+        for em in embeds:
+            try:
+                ballot = await thread.send(embed=em)
+                await ballot.add_reaction(VOTE_EMOJI)
+                ballots.append(ballot)
+            except Exception as e:
+                print(f"⚠️ error posting ballot embed: {e}")
+                ballots.append(None)
+        return ballots
+
+    emoji = discord.PartialEmoji.from_str(VOTE_EMOJI)._as_reaction()
+    for i, em in enumerate(embeds):
+        job_queue.publish("post_ballot", contest_key() + i, {
+            "channel_id": thread.id, "embed": em.to_dict(), "emoji": emoji, "batch": batch, "index": i
+        })
+    ids = await job_queue.wait_results(batch, len(embeds), BALLOT_WAIT_SECONDS)
+    return [thread.get_partial_message(ids[i]) if ids.get(i) else None for i in range(len(embeds))]
+
+async def run_worker(worker_index: int, worker_count: int):
+    """
+    Processus worker : REST seul (pas de connexion gateway).
+    Les workers partagent le budget QUEUE_RATE_PER_SECOND (sous la limite globale de Discord) ;
+    les limites par salon restent gérées par discord.py dans chaque processus, donc au-delà
+    de 2-3 workers la publication dans un même fil n'accélère plus.
+    QUEUE_DRY_RUN=1 : affiche les jobs au lieu d'appeler Discord (test hors-ligne).
+    """
+    queue = JobQueue(QUEUE_DB)
+    dry_run = os.getenv("QUEUE_DRY_RUN") == "1"
+    client = discord.Client(intents=discord.Intents.none())
+    if not dry_run:
+        await client.login(TOKEN)
+    print(f"🛠️ Worker {worker_index}/{worker_count} prêt ({QUEUE_DB}{', dry-run' if dry_run else ''}).")
+    try:
+        while True:
+            jobs = queue.claim(worker_index, worker_count)
+            if not jobs:
+                await asyncio.sleep(QUEUE_POLL_SECONDS)
+                continue
+            for job_id, kind, payload in jobs:
+                result = None
+                try:
+                    if dry_run:
+                        print(f"🧪 {kind} {payload}")
+                    else:
+                        await asyncio.sleep(queue.reserve(JOB_COSTS.get(kind, 1), QUEUE_RATE_PER_SECOND))
+                        result = await run_job(client, kind, payload)
+                except Exception as e:
+                    print(f"⚠️ job {job_id} ({kind}) error: {e}")
+                if kind == "post_ballot":
+                    queue.record_result(payload["batch"], payload["index"], result)
+                queue.ack(job_id)
+    finally:
+        await client.close()
+
+async def _reject(message: discord.Message, warning: str):
+    """Supprime le message et prévient l'auteur (avertissement auto-supprimé après 10s)."""
+    await dispatch_rest("delete_message", channel_id=message.channel.id, message_id=message.id)
+    await dispatch_rest("send_message", channel_id=message.channel.id, content=warning, delete_after=10)
+
 # =========================
 # AFFICHAGE RESULTATS
 # =========================
@@ -160,7 +755,13 @@ async def announce_winner(winners: list[discord.Message],
             return f"https://discord.com/channels/{ballot_message.guild.id}/{ballot_message.channel.id}/{orig_id}"
         return f"https://discord.com/channels/{ballot_message.guild.id}/{ballot_message.channel.id}/{ballot_message.id}"
 
+    def is_original(ballot_message: discord.Message) -> bool:
+        # mode paginé : le "ballot" est le post original (ses embeds = aperçus de liens)
+        return ballot_message.id not in ballot_to_orig and not ballot_message.author.bot
+
     def author_mention_from(ballot_message: discord.Message) -> str:
+        if is_original(ballot_message):
+            return ballot_message.author.mention
         if ballot_message.embeds:
             em = ballot_message.embeds[0]
             if em.footer and em.footer.text:
@@ -171,7 +772,11 @@ async def announce_winner(winners: list[discord.Message],
         w = winners[0]
         link = link_for(w)
         embed = None
-        if w.embeds:
+        if is_original(w):
+            if first_image_url(w):
+                embed = discord.Embed(title=f"📸 Photo gagnante – Round {round_number}")
+                embed.set_image(url=first_image_url(w))
+        elif w.embeds:
             em = w.embeds[0]
             embed = discord.Embed(title=f"📸 Photo gagnante – Round {round_number}")
             if em.image and em.image.url:
@@ -193,14 +798,16 @@ async def announce_winner(winners: list[discord.Message],
 # =========================
 # CREATION GALERIE (R1)
 # =========================
+@timed
 async def build_vote_gallery(vote_channel: discord.TextChannel) -> list[discord.Message]:
     """Crée un thread, reposte chaque photo en embed dans le thread, ajoute l’emoji, et ping dans thread + salon."""
-    global gallery_thread_id, round1_ballots, orig_to_ballot, ballot_to_orig
+    global gallery_thread_id, round1_ballots, orig_to_ballot, ballot_to_orig, paged_gallery
 
     round1_ballots = []
     orig_to_ballot = {}
     ballot_to_orig = {}
     gallery_thread_id = None
+    paged_gallery = None
 
     # Récupère les posts valides depuis le début de la phase
     originals: list[discord.Message] = []
@@ -223,11 +830,14 @@ async def build_vote_gallery(vote_channel: discord.TextChannel) -> list[discord.
         gallery_thread_id = vote_channel.id
 
     # Header dans le thread + mention
+    paged = GALLERY_MODE == "paged"
+    how_to = ("Cliquez sur **Parcourir et voter** ci-dessous." if paged
+              else f"Réagissez avec {VOTE_EMOJI} **dans ce fil** uniquement.")
     try:
         await thread.send(
             f"🗳️ **Galerie de vote – Round 1**\n"
-            f"📢 <@&{REPORTER_ROLE_ID}> <@&{REPORTER_BORDEAUX_ROLE_ID}> **c’est le moment de voter !**\n"
-            f"Réagissez avec {VOTE_EMOJI} **dans ce fil** uniquement."
+            f"📢 {reporter_mentions()} **c’est le moment de voter !**\n"
+            f"{how_to}"
         )
     except Exception:
         pass
@@ -237,45 +847,195 @@ async def build_vote_gallery(vote_channel: discord.TextChannel) -> list[discord.
         jump = thread.jump_url if isinstance(thread, discord.Thread) else f"https://discord.com/channels/{vote_channel.guild.id}/{gallery_thread_id}"
         await vote_channel.send(
             f"🔔 **Thread de vote ouvert** : [**cliquer ici pour voter**]({jump})\n"
-            f"📢 <@&{REPORTER_ROLE_ID}> <@&{REPORTER_BORDEAUX_ROLE_ID}>"
+            f"📢 {reporter_mentions()}"
         )
     except Exception as e:
         print(f"ℹ️ Annonce principale impossible: {e}")
 
+    # Mode paginé : un seul message (lanceur), votes par interactions
+    if paged:
+        entries = [msg for msg in originals if first_image_url(msg)]
+        gallery = PagedGallery(entries, round_number=1)
+        try:
+            await thread.send(embed=gallery.summary_embed(), view=GalleryLauncherView(gallery))
+        except Exception as e:
+            print(f"⚠️ error posting paged gallery: {e}")
+            return []
+        paged_gallery = gallery
+        round1_ballots = entries
+        return round1_ballots
+
     # Reposter chaque photo en embed (R1)
-    index = 1
+    entries: list[tuple[discord.Message, discord.Embed]] = []
     for msg in originals:
-        try:
-            img_url = next((att.url for att in msg.attachments
-                            if att.filename.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".webp"))), None)
-            if not img_url:
-                continue
+        img_url = first_image_url(msg)
+        if not img_url:
+            continue
 
-            author_tag = f"{msg.author.mention}"
-            orig_link = f"https://discord.com/channels/{msg.guild.id}/{msg.channel.id}/{msg.id}"
+        author_tag = f"{msg.author.mention}"
+        orig_link = f"https://discord.com/channels/{msg.guild.id}/{msg.channel.id}/{msg.id}"
 
-            em = discord.Embed(
-                title=f"Photo #{index}",
-                description=f"Soumise par {author_tag}\n[Ouvrir le post original]({orig_link})"
-            )
+        em = discord.Embed(
+            title=f"Photo #{len(entries) + 1}",
+            description=f"Soumise par {author_tag}\n[Ouvrir le post original]({orig_link})"
+        )
+        em.set_image(url=img_url)
+        em.set_footer(text=author_tag)
+        entries.append((msg, em))
+
+    ballots = await post_ballots(thread, [em for _, em in entries], batch=f"{gallery_thread_id}:r1")
+    for (msg, _), ballot in zip(entries, ballots):
+        if ballot is None:
+            continue
+        round1_ballots.append(ballot)
+        orig_to_ballot[msg.id] = ballot.id
+        ballot_to_orig[ballot.id] = msg.id
+
+    return round1_ballots
+
+# =========================
+# GALERIE PAGINÉE (GALLERY_MODE=paged)
+# =========================
+class PagedGallery:
+    """Entrées d'un round (posts originaux) + décompte des votes en mémoire."""
+
+    def __init__(self, entries: list[discord.Message], round_number: int):
+        self.entries = entries
+        self.round_number = round_number
+        self.votes: dict[int, set[int]] = {m.id: set() for m in entries}  # orig_msg_id -> user_ids
+        self.open = True
+
+    def toggle_vote(self, index: int, user_id: int) -> bool:
+        """Ajoute/retire le vote de l'utilisateur (comme une réaction). Renvoie True si voté."""
+        voters = self.votes[self.entries[index].id]
+        if user_id in voters:
+            voters.discard(user_id)
+            return False
+        voters.add(user_id)
+        return True
+
+    def tally(self) -> tuple[int, dict[discord.Message, int]]:
+        """Même forme que tally_votes_only (+1 par entrée, comme la réaction du bot)."""
+        vote_map = {m: len(self.votes[m.id]) + 1 for m in self.entries}
+        return max(vote_map.values(), default=0), vote_map
+
+    def summary_embed(self) -> discord.Embed:
+        return discord.Embed(
+            title=f"🖼️ Galerie – Round {self.round_number}",
+            description=f"**{len(self.entries)}** photo(s) en lice. Un vote par photo, cliquez à nouveau pour l’annuler."
+        )
+
+    def entry_embed(self, index: int, user_id: int) -> discord.Embed:
+        msg = self.entries[index]
+        orig_link = f"https://discord.com/channels/{msg.guild.id}/{msg.channel.id}/{msg.id}"
+        em = discord.Embed(
+            title=f"Photo #{index + 1}/{len(self.entries)} — Round {self.round_number}",
+            description=f"Soumise par {msg.author.mention}\n[Ouvrir le post original]({orig_link})"
+        )
+        img_url = first_image_url(msg)
+        if img_url:
             em.set_image(url=img_url)
-            em.set_footer(text=author_tag)
+        voted = user_id in self.votes[msg.id]
+        em.set_footer(text="✅ Tu as voté pour cette photo" if voted else "Pas encore voté pour cette photo")
+        return em
 
-            ballot = await thread.send(embed=em)
-            await ballot.add_reaction(VOTE_EMOJI)
 
-            round1_ballots.append(ballot)
-            orig_to_ballot[msg.id] = ballot.id
-            ballot_to_orig[ballot.id] = msg.id
-            index += 1
-        except Exception as e:
-            print(f"⚠️ error posting ballot embed: {e}")
+class GalleryLauncherView(discord.ui.View):
+    """Message public unique : ouvre une galerie éphémère propre à chaque votant."""
 
-    return round1_ballots
+    def __init__(self, gallery: PagedGallery):
+        super().__init__(timeout=None)
+        self.gallery = gallery
+
+    @discord.ui.button(label="Parcourir et voter", emoji="🗳️", style=discord.ButtonStyle.primary)
+    async def browse(self, inter: discord.Interaction, button: discord.ui.Button):
+        if not self.gallery.open or self.gallery is not paged_gallery:
+            await inter.response.send_message("🔒 Les votes de ce round sont fermés.", ephemeral=True)
+            return
+        page = GalleryPageView(self.gallery, inter.user.id)
+        await inter.response.send_message(embed=page.current_embed(), view=page, ephemeral=True)
+
+
+class GalleryPageView(discord.ui.View):
+    """Navigation ◀/▶ + menu de saut (fenêtre de 25) + bouton de vote."""
+
+    SELECT_WINDOW = 25  # limite Discord d'options par menu
+
+    def __init__(self, gallery: PagedGallery, user_id: int, index: int = 0):
+        super().__init__(timeout=15 * 60)
+        self.gallery = gallery
+        self.user_id = user_id
+        self.index = index
+        self._build()
+
+    def current_embed(self) -> discord.Embed:
+        return self.gallery.entry_embed(self.index, self.user_id)
+
+    def _build(self):
+        self.clear_items()
+        n = len(self.gallery.entries)
+
+        prev_btn = discord.ui.Button(emoji="◀️", style=discord.ButtonStyle.secondary, disabled=self.index == 0, row=0)
+        prev_btn.callback = self._prev
+        voted = self.user_id in self.gallery.votes[self.gallery.entries[self.index].id]
+        vote_btn = discord.ui.Button(
+            label="Retirer mon vote" if voted else "Voter",
+            emoji=VOTE_EMOJI,
+            style=discord.ButtonStyle.danger if voted else discord.ButtonStyle.success,
+            row=0
+        )
+        vote_btn.callback = self._vote
+        next_btn = discord.ui.Button(emoji="▶️", style=discord.ButtonStyle.secondary, disabled=self.index >= n - 1, row=0)
+        next_btn.callback = self._next
+        for item in (prev_btn, vote_btn, next_btn):
+            self.add_item(item)
+
+        if n > 1:
+            start = max(0, min(self.index - self.SELECT_WINDOW // 2, n - self.SELECT_WINDOW))
+            options = []
+            for i in range(start, min(start + self.SELECT_WINDOW, n)):
+                author = self.gallery.entries[i].author
+                options.append(discord.SelectOption(
+                    label=f"Photo #{i + 1} — {author.display_name}"[:100],
+                    value=str(i),
+                    default=i == self.index
+                ))
+            jump = discord.ui.Select(placeholder="Aller à la photo…", options=options, row=1)
+            jump.callback = self._jump
+            self.add_item(jump)
+
+    async def _show(self, inter: discord.Interaction):
+        if not self.gallery.open:
+            await inter.response.edit_message(content="🔒 Les votes de ce round sont fermés.", embed=None, view=None)
+            return
+        self._build()
+        await inter.response.edit_message(embed=self.current_embed(), view=self)
+
+    async def _prev(self, inter: discord.Interaction):
+        self.index = max(self.index - 1, 0)
+        await self._show(inter)
+
+    async def _next(self, inter: discord.Interaction):
+        self.index = min(self.index + 1, len(self.gallery.entries) - 1)
+        await self._show(inter)
+
+    async def _jump(self, inter: discord.Interaction):
+        self.index = int(inter.data["values"][0])
+        await self._show(inter)
+
+    async def _vote(self, inter: discord.Interaction):
+        member = inter.user if isinstance(inter.user, discord.Member) else None
+        if not can_vote(inter.guild_id, self.user_id, member):
+            await inter.response.send_message("🚫 Tu n’as pas le rôle requis pour voter.", ephemeral=True)
+            return
+        if self.gallery.open:
+            self.gallery.toggle_vote(self.index, self.user_id)
+        await self._show(inter)
 
 # =========================
 # SECOND TOUR (R2)
 # =========================
+@timed
 async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
     """
     Lance le Round 2:
@@ -285,7 +1045,7 @@ async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
       - Le comptage se fait sur ces nouveaux messages uniquement
     """
     global tie_round_active, tie_round_end_time, votes_open, current_round_number
-    global tie_task, tie_finishing, round2_ballots, tie_allowed_ids, ballot_to_orig
+    global tie_task, tie_finishing, round2_ballots, tie_allowed_ids, ballot_to_orig, paged_gallery
 
     results_channel = bot.get_channel(PHOTO_RESULT_CHANNEL_ID)
     if not isinstance(results_channel, discord.TextChannel):
@@ -310,24 +1070,24 @@ async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
     tie_round_end_time = datetime.now() + timedelta(minutes=minutes)
 
     # 1) Verrouiller tous les ballots R1 (retire réactions + badge 🔒)
-    for b in list(round1_ballots):
-        try:
-            await b.clear_reactions()
-            if b.embeds:
-                em = b.embeds[0]
-                if "🔒 Hors second tour" not in (em.title or "") and "✅ Second tour" not in (em.title or ""):
-                    # on évite de dupliquer les badges si relancé
-                    em.title = (em.title or "Photo") + " — 🔒 Hors second tour"
-                await b.edit(embed=em)
-        except Exception as e:
-            print(f"⚠️ lock R1 error: {e}")
+    paged = paged_gallery is not None
+    if paged:
+        paged_gallery.open = False
+    for b in ([] if paged else list(round1_ballots)):
+        em = b.embeds[0] if b.embeds else None
+        if em and "🔒 Hors second tour" not in (em.title or "") and "✅ Second tour" not in (em.title or ""):
+            # on évite de dupliquer les badges si relancé
+            em.title = (em.title or "Photo") + " — 🔒 Hors second tour"
+        await dispatch_rest("lock_ballot", channel_id=b.channel.id, message_id=b.id,
+                            embed=em.to_dict() if em else None)
 
     # 2) Mention dans le thread + explications
     try:
         await thread.send(
             f"⚠️ **Égalité détectée — Round 2 pour {fmt_duration(minutes)}.**\n"
-            f"📢 <@&{REPORTER_ROLE_ID}> <@&{REPORTER_BORDEAUX_ROLE_ID}> **revotez ici** sur les photos finalistes.\n"
-            f"Seuls les messages ci-dessous sont ouverts au vote {VOTE_EMOJI}."
+            f"📢 {reporter_mentions()} **revotez ici** sur les photos finalistes.\n"
+            + ("Seule la galerie ci-dessous est ouverte au vote." if paged
+               else f"Seuls les messages ci-dessous sont ouverts au vote {VOTE_EMOJI}.")
         )
     except Exception:
         pass
@@ -335,32 +1095,49 @@ async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
     # 3) Reposter de NOUVEAUX embeds pour les finalistes (Round 2)
     round2_ballots = []
     tie_allowed_ids = set()
-    idx = 1
-    for b in candidates_r1:
+    if paged:
+        # Mode paginé : nouvelle galerie limitée aux finalistes (candidats = posts originaux)
+        gallery = PagedGallery(list(candidates_r1), round_number=2)
         try:
-            # Récup info du ballot R1
-            em = b.embeds[0] if b.embeds else None
-            img_url = em.image.url if (em and em.image) else None
-            author_tag = em.footer.text if (em and em.footer and em.footer.text) else "Auteur"
-            # Lien vers l'original (grâce au mapping ballot_to_orig)
-            orig_id = ballot_to_orig.get(b.id)
-            if orig_id:
-                orig_link = f"https://discord.com/channels/{b.guild.id}/{b.channel.id}/{orig_id}"
-            else:
-                orig_link = b.jump_url
-
-            # Embed Round 2
-            em2 = discord.Embed(
-                title=f"Finaliste #{idx} — Round 2",
-                description=f"{author_tag}\n[Voir le post original]({orig_link})"
-            )
-            if img_url:
-                em2.set_image(url=img_url)
-            em2.set_footer(text=author_tag)
-
-            new_ballot = await thread.send(embed=em2)
-            await new_ballot.add_reaction(VOTE_EMOJI)
+            await thread.send(embed=gallery.summary_embed(), view=GalleryLauncherView(gallery))
+        except Exception as e:
+            # rien à voter : on annule le Round 2 (comme build_vote_gallery qui renvoie [])
+            print(f"⚠️ post R2 paged gallery error: {e}")
+            tie_round_active = False
+            votes_open = False
+            current_round_number = 1
+            tie_round_end_time = None
+            return
+        paged_gallery = gallery
+        round2_ballots = gallery.entries
+    finalists: list[tuple[int | None, discord.Embed]] = []
+    for b in ([] if paged else candidates_r1):
+        # Récup info du ballot R1
+        em = b.embeds[0] if b.embeds else None
+        img_url = em.image.url if (em and em.image) else None
+        author_tag = em.footer.text if (em and em.footer and em.footer.text) else "Auteur"
+        # Lien vers l'original (grâce au mapping ballot_to_orig)
+        orig_id = ballot_to_orig.get(b.id)
+        if orig_id:
+            orig_link = f"https://discord.com/channels/{b.guild.id}/{b.channel.id}/{orig_id}"
+        else:
+            orig_link = b.jump_url
 
+        # Embed Round 2
+        em2 = discord.Embed(
+            title=f"Finaliste #{len(finalists) + 1} — Round 2",
+            description=f"{author_tag}\n[Voir le post original]({orig_link})"
+        )
+        if img_url:
+            em2.set_image(url=img_url)
+        em2.set_footer(text=author_tag)
+        finalists.append((orig_id, em2))
+
+    if finalists:
+        ballots = await post_ballots(thread, [em2 for _, em2 in finalists], batch=f"{thread.id}:r2")
+        for (orig_id, _), new_ballot in zip(finalists, ballots):
+            if new_ballot is None:
+                continue
             round2_ballots.append(new_ballot)
             tie_allowed_ids.add(new_ballot.id)
 
@@ -368,15 +1145,11 @@ async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
             if orig_id:
                 ballot_to_orig[new_ballot.id] = orig_id
 
-            idx += 1
-        except Exception as e:
-            print(f"⚠️ post R2 ballot error: {e}")
-
     # 4) Annonce dans le salon résultats avec lien vers le thread
     location_link = f"https://discord.com/channels/{thread.guild.id}/{thread.id}"
     await results_channel.send(
         f"⚠️ **Égalité détectée — Round 2 pour {fmt_duration(minutes)}.**\n"
-        f"📢 <@&{REPORTER_ROLE_ID}> <@&{REPORTER_BORDEAUX_ROLE_ID}> Revotez **dans le thread** !\n"
+        f"📢 {reporter_mentions()} Revotez **dans le thread** !\n"
         f"🔗 [Accéder au thread de vote]({location_link})"
     )
 
@@ -405,7 +1178,7 @@ async def start_tie_break(candidates_r1: list[discord.Message], minutes: int):
 async def finish_tie_break():
     """Clôture le second tour et annonce le(s) gagnant(s)."""
     global tie_round_active, votes_open, tie_round_end_time, tie_task, tie_finishing
-    global round2_ballots, tie_allowed_ids
+    global round2_ballots, tie_allowed_ids, paged_gallery
 
     if tie_finishing:
         return
@@ -420,7 +1193,11 @@ async def finish_tie_break():
     tie_round_active = False
 
     # Compter uniquement sur les nouveaux ballots R2
-    max_votes, vote_map = await tally_votes_only(round2_ballots)
+    if paged_gallery is not None:
+        paged_gallery.open = False
+        max_votes, vote_map = paged_gallery.tally()
+    else:
+        max_votes, vote_map = await tally_votes_only(round2_ballots)
     if not vote_map:
         await results_channel.send("😕 Aucun vote comptabilisé pendant le second tour.")
     else:
@@ -430,6 +1207,7 @@ async def finish_tie_break():
     # Reset state R2
     round2_ballots = []
     tie_allowed_ids = set()
+    paged_gallery = None
     tie_round_end_time = None
     if tie_task and not tie_task.done():
         tie_task.cancel()
@@ -452,6 +1230,17 @@ async def on_ready():
     except Exception as e:
         print(f"⚠️ Sync error: {e}")
     print(f"{bot.user.name} connecté.")
+    enable_slow_callback_detection(asyncio.get_running_loop())
+    # on_ready est aussi rappelé après une reconnexion complète (session non reprise) :
+    # événements de rôles possiblement manqués → cache reconstruit à la demande
+    role_caches.clear()
+    role_verdicts.clear()
+    schedule_reconcile()
+
+@bot.event
+async def on_resumed():
+    # session reprise : Discord rejoue les événements manqués, le cache des rôles reste valide
+    schedule_reconcile()
 
 @bot.event
 async def on_message_delete(message: discord.Message):
@@ -469,109 +1258,85 @@ async def on_message(message: discord.Message):
         return
 
     if message.channel.id == PHOTO_CHANNEL_ID:
-        global votes_open
-
-        # Pendant n'importe quel vote (R1/R2) -> pas de nouveaux posts
-        if votes_open:
-            try:
-                await message.delete()
-                await message.channel.send(
-                    f"❌ {message.author.mention}, votes en cours. Nouveaux posts interdits.",
-                    delete_after=10
-                )
-            except Exception:
-                pass
+        _advance_checkpoint(message.id)
+        if not _claim_photo_message(message.id):
+            return  # déjà traité par la réconciliation
+        if not await moderate_photo_message(message):
             return
 
-        # Phase dépôt: 1 image / message, 1 photo / personne
-        if posting_phase_active():
-            img_count = count_image_attachments(message)
-            if img_count == 0:
-                try:
-                    await message.delete()
-                    await message.channel.send(
-                        f"🚫 {message.author.mention}, seuls les **messages avec photo** sont autorisés.",
-                        delete_after=10
-                    )
-                except Exception:
-                    pass
-                return
-            if img_count > 1:
-                try:
-                    await message.delete()
-                    await message.channel.send(
-                        f"🚫 {message.author.mention}, **1 image par message** et **1 photo par personne**.",
-                        delete_after=10
-                    )
-                except Exception:
-                    pass
-                return
-            if message.author.id in submitted_users:
-                try:
-                    await message.delete()
-                    await message.channel.send(
-                        f"🚫 {message.author.mention}, tu as déjà posté **1 photo**. "
-                        f"Supprime ton message initial pour remplacer.",
-                        delete_after=10
-                    )
-                except Exception:
-                    pass
-                return
-
-            _record_submission(message.author.id, message.id)
+    await bot.process_commands(message)
 
-        else:
-            # Pas de concours : on garde le salon propre
-            if not is_image_message(message):
-                try:
-                    await message.delete()
-                    await message.channel.send(
-                        f"🚫 {message.author.mention}, aucun concours en cours. Les messages sans photo sont supprimés.",
-                        delete_after=10
-                    )
-                except Exception:
-                    pass
-                return
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.roles != after.roles and after.guild.id in role_caches:
+        role_caches[after.guild.id].index(after)
 
-    await bot.process_commands(message)
+@bot.event
+async def on_member_remove(member: discord.Member):
+    if member.guild.id in role_caches:
+        role_caches[member.guild.id].forget(member.id)
+
+def _drop_role_verdicts(guild_id: int):
+    for key in [k for k in role_verdicts if k[0] == guild_id]:
+        del role_verdicts[key]
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    if before.permissions == after.permissions:
+        return
+    _drop_role_verdicts(after.guild.id)
+    cache = role_caches.get(after.guild.id)
+    if cache is None:
+        return
+    for member in after.members:
+        cache.index(member)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    # rare : on reconstruit le cache à la prochaine consultation
+    _drop_role_verdicts(role.guild.id)
+    role_caches.pop(role.guild.id, None)
+
+@bot.event
+async def on_guild_update(before: discord.Guild, after: discord.Guild):
+    if before.owner_id != after.owner_id:
+        role_caches.pop(after.id, None)
+
+async def _remove_vote_reaction(payload: discord.RawReactionActionEvent):
+    await dispatch_rest("remove_reaction", channel_id=payload.channel_id, message_id=payload.message_id,
+                        emoji=payload.emoji._as_reaction(), user_id=payload.user_id)
 
 @bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     """
+    Votants éligibles (VOTER_ROLES): les votes des autres membres dans le thread sont retirés.
     Pendant le second tour:
     - seules les réactions {VOTE_EMOJI} sur les messages Round 2 sont acceptées
     - les réactions dans un autre channel/thread OU sur un ballot non autorisé sont retirées
     """
-    if not tie_round_active:
+    if gallery_thread_id is None or paged_gallery is not None:
+        return
+
+    if (VOTER_ROLE_IDS and votes_open and payload.channel_id == gallery_thread_id
+            and str(payload.emoji) == VOTE_EMOJI and payload.user_id != bot.user.id
+            and not can_vote(payload.guild_id, payload.user_id, payload.member)):
+        await _remove_vote_reaction(payload)
         return
-    if gallery_thread_id is None:
+
+    if not tie_round_active:
         return
 
     # En dehors du thread -> supprimer si c'est le vote emoji
     if payload.channel_id != gallery_thread_id:
         if str(payload.emoji) == VOTE_EMOJI and payload.user_id != bot.user.id:
-            try:
-                channel = bot.get_channel(payload.channel_id)
-                if channel:
-                    message = await channel.fetch_message(payload.message_id)
-                    user = bot.get_user(payload.user_id) or await bot.fetch_user(payload.user_id)
-                    await message.remove_reaction(payload.emoji, user)
-            except Exception as e:
-                print(f"⚠️ remove reaction outside thread: {e}")
+            await _remove_vote_reaction(payload)
         return
 
     # Dans le thread: seulement sur les ballots R2 autorisés
     if str(payload.emoji) != VOTE_EMOJI or payload.user_id == bot.user.id:
         return
     if payload.message_id not in tie_allowed_ids:
-        try:
-            channel = bot.get_channel(payload.channel_id)
-            if channel:
-                message = await channel.fetch_message(payload.message_id)
-                user = bot.get_user(payload.user_id) or await bot.fetch_user(payload.user_id)
-                await message.remove_reaction(payload.emoji, user)
-        except Exception as e:
-            print(f"⚠️ remove reaction on locked ballot: {e}")
+        await _remove_vote_reaction(payload)
 
 # =========================
 # COMMANDES SLASH (≤100 chars) — defer + followup
@@ -585,13 +1350,15 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
 async def start_posting(inter: discord.Interaction):
     await inter.response.defer(ephemeral=True)
 
-    global photo_start_time, votes_open, tie_round_active, tie_round_end_time
+    global photo_start_time, contest_id, votes_open, tie_round_active, tie_round_end_time
     global current_round_number, tie_task, tie_finishing
     global submitted_users, user_to_msgids, msgid_to_user
     global gallery_thread_id, round1_ballots, orig_to_ballot, ballot_to_orig
-    global round2_ballots, tie_allowed_ids
+    global round2_ballots, tie_allowed_ids, paged_gallery
+    global last_seen_photo_msgid, reconcile_verify_after
 
     photo_start_time = datetime.now()
+    contest_id = inter.id  # snowflake de la commande : unique et stable pour tout le concours
     votes_open = False
     tie_round_active = False
     tie_round_end_time = None
@@ -608,6 +1375,9 @@ async def start_posting(inter: discord.Interaction):
     orig_to_ballot = {}
     ballot_to_orig = {}
     tie_allowed_ids = set()
+    paged_gallery = None
+    last_seen_photo_msgid = None
+    reconcile_verify_after = None
 
     if tie_task and not tie_task.done():
         tie_task.cancel()
@@ -669,7 +1439,7 @@ async def open_votes(inter: discord.Interaction):
 async def close_votes(inter: discord.Interaction, tie_round_minutes: app_commands.Range[int, 1, 24*60] = DEFAULT_TIE_MINUTES):
     await inter.response.defer(ephemeral=True)
 
-    global votes_open, tie_task
+    global votes_open, tie_task, round1_ballots
 
     if photo_start_time is None:
         await inter.followup.send("❌ Aucune phase active.", ephemeral=True)
@@ -698,7 +1468,13 @@ async def close_votes(inter: discord.Interaction, tie_round_minutes: app_command
         await inter.followup.send("🤷 Pas de galerie de vote ouverte.", ephemeral=True)
         return
 
-    max_votes, vote_map = await tally_votes_only(round1_ballots)
+    if paged_gallery is not None:
+        paged_gallery.open = False
+        max_votes, vote_map = paged_gallery.tally()
+    else:
+        max_votes, vote_map = await tally_votes_only(round1_ballots)
+        # messages complets (embeds) : utilisés pour verrouiller les ballots R1 au second tour
+        round1_ballots = list(vote_map)
     if not vote_map:
         await inter.followup.send("🤷 Aucun message candidat.", ephemeral=True)
         return
@@ -745,6 +1521,52 @@ async def status(inter: discord.Interaction):
         ephemeral=True
     )
 
+@bot.tree.command(
+    name="debug_profile",
+    description="Profile la boucle pendant N secondes et envoie le flamegraph dans le salon résultats."
+)
+@app_commands.describe(seconds="Durée d'échantillonnage en secondes (défaut 30).")
+@app_commands.guilds(discord.Object(id=GUILD_ID))
+@moderator_check()
+async def debug_profile(inter: discord.Interaction, seconds: app_commands.Range[int, 5, 300] = 30):
+    await inter.response.defer(ephemeral=True)
+
+    global active_profiler
+    if active_profiler is not None:
+        await inter.followup.send("ℹ️ Un profil est déjà en cours.", ephemeral=True)
+        return
+
+    results_channel = bot.get_channel(PHOTO_RESULT_CHANNEL_ID)
+    if not isinstance(results_channel, discord.TextChannel):
+        await inter.followup.send("⚠️ Salon résultats introuvable.", ephemeral=True)
+        return
+
+    # réservé avant tout await : deux commandes simultanées ne lancent pas deux échantillonneurs
+    active_profiler = SamplingProfiler(asyncio.get_running_loop())
+    try:
+        await inter.followup.send(f"🔬 Profilage lancé pour **{seconds}s**…", ephemeral=True)
+        await active_profiler.run(seconds)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        files = [
+            discord.File(io.BytesIO(SamplingProfiler.folded(active_profiler.cpu_stacks)),
+                         filename=f"profile-cpu-{stamp}.folded"),
+            discord.File(io.BytesIO(SamplingProfiler.folded(active_profiler.await_stacks)),
+                         filename=f"profile-await-{stamp}.folded"),
+        ]
+        await results_channel.send(
+            f"🔬 **Profil de {seconds}s** (format folded : flamegraph.pl / speedscope)\n"
+            f"{timings_summary()}",
+            files=files
+        )
+    except Exception as e:
+        print(f"⚠️ debug_profile error: {e}")
+        try:
+            await inter.followup.send(f"⚠️ Échec du profilage : {e}", ephemeral=True)
+        except Exception:
+            pass
+    finally:
+        active_profiler = None
+
 # =========================
 # PREFIX (optionnel)
 # =========================
@@ -756,6 +1578,12 @@ async def ping(ctx: commands.Context):
 # RUN
 # =========================
 if __name__ == "__main__":
-    if not TOKEN:
+    worker_mode = len(sys.argv) > 1 and sys.argv[1] == "worker"
+    if not TOKEN and not (worker_mode and os.getenv("QUEUE_DRY_RUN") == "1"):
         raise RuntimeError("Missing DISCORD_TOKEN in environment.")
-    bot.run(TOKEN)
+    if worker_mode:
+        # python bot.py worker <index> <count>
+        index, count = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (0, 1)
+        asyncio.run(run_worker(index, count))
+    else:
+        bot.run(TOKEN)